@@ -1,8 +1,7 @@
-from dataclasses import dataclass
+from typing import NamedTuple
 
 
-@dataclass
-class DurationResult:
+class DurationResult(NamedTuple):
     minutes: int
     text: str
     is_valid: bool = True
@@ -1,10 +1,32 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+DB_URL = os.getenv("DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+_engine_options = {"pool_recycle": DB_POOL_RECYCLE, "pool_pre_ping": True}
+# the app runs on MySQL; this only guards against a sqlite:// URL, whose
+# non-QueuePool pool would reject the sizing arguments
+if make_url(DB_URL).get_backend_name() != "sqlite":
+    _engine_options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT
+    )
+
+engine = create_engine(DB_URL, **_engine_options)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base = declarative_base()
+
 
 def get_db():
     db = SessionLocal()
@@ -14,9 +36,7 @@ def get_db():
         db.close()
 
 
-DB_URL = os.getenv("DATABASE_URL")
-
-engine = create_engine(DB_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
+def init_db():
+    # models must be imported so their tables are registered on Base.metadata
+    from app import models  # noqa: F401
+    Base.metadata.create_all(bind=engine)
@@ -1,7 +1,41 @@
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
 
+class DuplicateMessageFilter(logging.Filter):
+    """
+    Drops records whose message was already emitted within the last `ttl` seconds.
+    Errors and above always pass so failures are never suppressed
+    """
+    def __init__(self, ttl: float = 5.0, maxsize: int = 1024):
+        super().__init__()
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        key = hashlib.sha1(record.getMessage().encode("utf-8")).digest()
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._seen.get(key)
+            if expires_at is not None and expires_at > now:
+                return False
+
+            self._seen[key] = now + self.ttl
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.maxsize:
+                self._seen.popitem(last=False)
+        return True
+
+
 class LoggerService:
     def __init__(self, name: str = __name__):
         self.logger = logging.getLogger(name)
@@ -11,8 +45,10 @@ class LoggerService:
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             handler.setFormatter(formatter)
+            handler.addFilter(DuplicateMessageFilter())
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
 
     def info(self, message: str, extra: Optional[dict] = None):
         self.logger.info(message, extra=extra)
@@ -26,6 +62,13 @@ class LoggerService:
     def debug(self, message: str, extra: Optional[dict] = None):
         self.logger.debug(message, extra=extra)
 
+    def is_debug_enabled(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+
+_logger_service = LoggerService("app")
+
 
-def get_logger_service() -> LoggerService:
-    return LoggerService()
+async def get_logger_service() -> LoggerService:
+    # async so FastAPI resolves it on the event loop instead of a worker thread
+    return _logger_service
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, UniqueConstraint, Index, CheckConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -18,7 +18,15 @@ class Flight(Base):
     destination_timezone = Column(String(50), nullable=True)
     origin_gmt_offset = Column(String(10), nullable=True)
     destination_gmt_offset = Column(String(10), nullable=True)
-    assignments = relationship("FlightAssignment", back_populates="flight", cascade="all, delete-orphan")
+    assignments = relationship("FlightAssignment", back_populates="flight", cascade="all, delete-orphan", passive_deletes=True)
+    __table_args__ = (
+        UniqueConstraint('flight_number', 'direction', 'departure_time', name='unique_flight_departure'),
+        Index('ix_flights_departure_time', 'departure_time'),
+    )
+
+    @property
+    def route(self) -> str:
+        return f"{self.origin} → {self.destination}"
 
 
 class CrewMember(Base):
@@ -27,7 +35,10 @@ class CrewMember(Base):
     name = Column(String(255), nullable=False)
     role = Column(String(255), nullable=False)
     is_on_leave = Column(Boolean, default=False, nullable=False)
-    assignments = relationship("FlightAssignment", back_populates="crew_member", cascade="all, delete-orphan")
+    assignments = relationship("FlightAssignment", back_populates="crew_member", cascade="all, delete-orphan", passive_deletes=True)
+    __table_args__ = (
+        CheckConstraint("lower(role) IN ('pilot', 'flight attendant')", name='ck_crew_members_role'),
+    )
 
 
 class FlightAssignment(Base):
@@ -42,4 +53,6 @@ class FlightAssignment(Base):
     crew_member = relationship("CrewMember", back_populates="assignments")
     __table_args__ = (
         UniqueConstraint('flight_id', 'crew_id', name='unique_flight_crew_assignment'),
+        Index('ix_fa_crew_flight', 'crew_id', 'flight_id'),
+        Index('ix_fa_flight_status_crew', 'flight_id', 'status', 'crew_id'),
     )
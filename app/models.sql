@@ -1,6 +1,5 @@
 
 -- DROP TABLE IF EXISTS flight_assignments;
--- DROP TABLE IF EXISTS crew_schedules;
 -- DROP TABLE IF EXISTS crew_members;
 -- DROP TABLE IF EXISTS flights;
 
@@ -18,46 +17,33 @@
 --     origin_timezone VARCHAR(50),
 --     destination_timezone VARCHAR(50),
 --     origin_gmt_offset VARCHAR(10),
---     destination_gmt_offset VARCHAR(10)
+--     destination_gmt_offset VARCHAR(10),
+--     CONSTRAINT unique_flight_departure UNIQUE (flight_number, direction, departure_time)
 -- );
 
 -- CREATE TABLE crew_members (
 --     id INT PRIMARY KEY AUTO_INCREMENT,
---     name VARCHAR(255),
---     role VARCHAR(255),
---     is_on_leave BOOLEAN NOT NULL DEFAULT FALSE
+--     name VARCHAR(255) NOT NULL,
+--     role VARCHAR(255) NOT NULL,
+--     is_on_leave BOOLEAN NOT NULL DEFAULT FALSE,
+--     CONSTRAINT ck_crew_members_role CHECK (lower(role) IN ('pilot', 'flight attendant'))
 -- );
 
 -- CREATE TABLE flight_assignments (
 --     id INT PRIMARY KEY AUTO_INCREMENT,
---     flight_id INT,
---     flight_number VARCHAR(20),
---     departure VARCHAR(255),
---     arrival VARCHAR(255),
---     crew_id INT,
---     crew_name VARCHAR(255),
---     departure_time DATETIME NULL,
---     arrival_time DATETIME NULL,
---     duration_minutes INT,
---     FOREIGN KEY (flight_id) REFERENCES flights(id),
---     FOREIGN KEY (crew_id) REFERENCES crew_members(id)
--- );
-
--- CREATE TABLE crew_schedules (
---     id INT PRIMARY KEY AUTO_INCREMENT,
---     crew_id INT,
---     crew_name VARCHAR(255),
---     flight_id INT,
---     flight_number VARCHAR(20),
---     departure_time DATETIME NULL,
---     arrival_time DATETIME NULL,
---     FOREIGN KEY (crew_id) REFERENCES crew_members(id),
---     FOREIGN KEY (flight_id) REFERENCES flights(id)
+--     flight_id INT NOT NULL,
+--     crew_id INT NOT NULL,
+--     assigned_at DATETIME NOT NULL,
+--     status VARCHAR(20) DEFAULT 'active',
+--     notes VARCHAR(500) NULL,
+--     CONSTRAINT unique_flight_crew_assignment UNIQUE (flight_id, crew_id),
+--     FOREIGN KEY (flight_id) REFERENCES flights(id) ON DELETE CASCADE,
+--     FOREIGN KEY (crew_id) REFERENCES crew_members(id) ON DELETE CASCADE
 -- );
 
--- CREATE INDEX idx_flights_flight_number ON flights(flight_number);
--- CREATE INDEX idx_crew_members_role ON crew_members(role);
--- CREATE INDEX idx_flight_assignments_flight_id ON flight_assignments(flight_id);
--- CREATE INDEX idx_flight_assignments_crew_id ON flight_assignments(crew_id);
--- CREATE INDEX idx_crew_schedules_crew_id ON crew_schedules(crew_id);
--- CREATE INDEX idx_crew_schedules_flight_id ON crew_schedules(flight_id);
\ No newline at end of file
+-- CREATE INDEX ix_flights_flight_number ON flights(flight_number);
+-- CREATE INDEX ix_flights_departure_time ON flights(departure_time);
+-- CREATE INDEX ix_fa_crew_flight ON flight_assignments(crew_id, flight_id);
+-- CREATE INDEX ix_fa_flight_status_crew ON flight_assignments(flight_id, status, crew_id);
+-- databases created with the earlier (status, flight_id) index can drop it:
+-- DROP INDEX ix_fa_status_flight ON flight_assignments;
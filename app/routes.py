@@ -1,33 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
 from app import models, schemas
-from .database import get_db
+from .cache import response_cache
+from .database import SessionLocal, get_db
 from .utils import store_luton_flights
 from .validations import validate_flight_assignment
 from .logger_service import LoggerService, get_logger_service
-from .config import BusinessRules
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
-business_rules = BusinessRules()
+
+# rows fetched per batch when materialising list endpoints
+LIST_BATCH_SIZE = 500
+# upper bound for the optional ?limit= on list endpoints
+MAX_PAGE_SIZE = 1000
+
+
+def _paginate(stmt, order_column, limit: Optional[int], offset: int):
+    # without a limit the full list is returned, as the UI expects
+    if limit is None and not offset:
+        return stmt
+    return stmt.order_by(order_column).offset(offset).limit(limit)
 
 
 @router.post("/crew", response_model=schemas.CrewMemberRead, status_code=201)
 def create_crew(crew: schemas.CrewMemberCreate, db: Session = Depends(get_db), logger: LoggerService = Depends(get_logger_service)):
-    db_crew = models.CrewMember(**crew.dict())
+    db_crew = models.CrewMember(**crew.model_dump())
     db.add(db_crew)
+    # flush assigns the id; snapshot before commit expires the instance so the
+    # response needs no refresh SELECT
+    db.flush()
+    created = schemas.CrewMemberRead.model_validate(db_crew)
     db.commit()
-    db.refresh(db_crew)
     logger.info(f"Created crew member: {crew.name} ({crew.role})")
-    return db_crew
+    return created
 
 
 @router.get("/crew", response_model=List[schemas.CrewMemberRead])
-def get_all_crew_members(db: Session = Depends(get_db), logger: LoggerService = Depends(get_logger_service)):
+def get_all_crew_members(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    logger: LoggerService = Depends(get_logger_service)
+):
     try:
-        crew_members = db.query(models.CrewMember).all()
+        stmt = _paginate(select(models.CrewMember), models.CrewMember.id, limit, offset)
+        stmt = stmt.execution_options(yield_per=LIST_BATCH_SIZE)
+        crew_members = [schemas.CrewMemberRead.model_validate(crew) for crew in db.scalars(stmt)]
         logger.info(f"Retrieved {len(crew_members)} crew members")
         return crew_members
     except Exception as e:
@@ -37,53 +60,64 @@ def get_all_crew_members(db: Session = Depends(get_db), logger: LoggerService =
 
 @router.patch("/crew/{crew_id}", response_model=schemas.CrewMemberRead)
 def update_crew(crew_id: int, crew_update: schemas.CrewMemberUpdate, db: Session = Depends(get_db), logger: LoggerService = Depends(get_logger_service)):
-    crew = db.query(models.CrewMember).filter(models.CrewMember.id == crew_id).first()
+    crew = db.get(models.CrewMember, crew_id)
     if not crew:
         raise HTTPException(status_code=404, detail="Crew member not found")
 
     if crew_update.role and crew_update.role.lower() != crew.role.lower():
-        active_assignments = db.query(models.FlightAssignment).filter(
-            models.FlightAssignment.crew_id == crew_id,
-            models.FlightAssignment.status == "active"
-        ).count()
-
-        if active_assignments > 0:
+        has_active_assignments = db.scalar(
+            select(exists().where(
+                models.FlightAssignment.crew_id == crew_id,
+                models.FlightAssignment.status == "active"
+            ))
+        )
+
+        if has_active_assignments:
             raise HTTPException(
                 status_code=409,
-                detail=f"Cannot change role while crew member has {active_assignments} active flight assignments. Remove assignments first."
+                detail="Cannot change role while crew member has active flight assignments. Remove assignments first."
             )
 
-    update_data = crew_update.dict(exclude_unset=True)
+    update_data = crew_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(crew, field, value)
 
+    db.flush()
+    updated = schemas.CrewMemberRead.model_validate(crew)
     db.commit()
-    db.refresh(crew)
+    response_cache.invalidate()
     logger.info(f"Updated crew member {crew_id}: {update_data}")
-    return crew
+    return updated
 
 
 @router.delete("/crew/{crew_id}")
 def delete_crew(crew_id: int, db: Session = Depends(get_db), logger: LoggerService = Depends(get_logger_service)):
-    crew = db.query(models.CrewMember).filter(models.CrewMember.id == crew_id).first()
-    if not crew:
+    # flight_assignments.crew_id is ON DELETE CASCADE, the database removes the assignments
+    result = db.execute(
+        delete(models.CrewMember).where(models.CrewMember.id == crew_id),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
+        db.rollback()
         logger.warning(f"Crew member {crew_id} not found for deletion")
         raise HTTPException(status_code=404, detail="Crew member not found")
 
-    db.delete(crew)
     db.commit()
-    logger.info(f"Deleted crew member {crew_id} ({crew.name})")
+    response_cache.invalidate()
+    logger.info(f"Deleted crew member {crew_id}")
     return {"message": f"Crew member {crew_id} and related assignments deleted."}
 
 
 @router.post("/assign-flight/{crew_id}/{flight_id}", status_code=201)
 def assign_flight(crew_id: int, flight_id: int, db: Session = Depends(get_db), logger: LoggerService = Depends(get_logger_service)):
-    crew = db.query(models.CrewMember).filter(models.CrewMember.id == crew_id).first()
+    # lock the crew and flight rows (always in this order) until commit so that
+    # concurrent assignments cannot both pass validation and double-book
+    crew = db.get(models.CrewMember, crew_id, with_for_update=True)
     if not crew:
         logger.warning(f"Crew member {crew_id} not found for assignment")
         raise HTTPException(status_code=404, detail="Crew member not found")
 
-    flight = db.query(models.Flight).filter(models.Flight.id == flight_id).first()
+    flight = db.get(models.Flight, flight_id, with_for_update=True)
     if not flight:
         logger.warning(f"Flight {flight_id} not found for assignment")
         raise HTTPException(status_code=404, detail="Flight not found")
@@ -96,82 +130,100 @@ def assign_flight(crew_id: int, flight_id: int, db: Session = Depends(get_db), l
 
     validate_flight_assignment(db, crew_id, flight, departure_time, arrival_time)
 
-    new_assignment = models.FlightAssignment(
-        flight_id=flight.id,
-        crew_id=crew.id,
-        assigned_at=datetime.now(timezone.utc),
-        status="active"
-    )
-    db.add(new_assignment)
+    assigned_at = datetime.now(timezone.utc)
+    # read everything the response needs before commit expires crew and flight,
+    # otherwise each access afterwards reloads the row
+    flight_number = flight.flight_number
+    crew_name = crew.name
+    flight_details = {
+        "flight_number": flight_number,
+        "route": flight.route,
+        "departure": schemas.format_display_time(departure_time),
+        "arrival": schemas.format_display_time(arrival_time),
+        "duration": flight.duration_text
+    }
+    crew_info = {
+        "name": crew_name,
+        "role": crew.role
+    }
 
     try:
+        result = db.execute(
+            insert(models.FlightAssignment).values(
+                flight_id=flight_id,
+                crew_id=crew_id,
+                assigned_at=assigned_at,
+                status="active"
+            )
+        )
+        assignment_id = result.inserted_primary_key[0]
         db.commit()
-        db.refresh(new_assignment)
-        logger.info(f"Assigned crew {crew.name} to flight {flight.flight_number}")
+        response_cache.invalidate()
+        logger.info(f"Assigned crew {crew_name} to flight {flight_number}")
+    except IntegrityError:
+        # unique_flight_crew_assignment is the final guard against duplicates
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Crew member is already assigned to flight {flight_number}")
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create assignment: {str(e)}")
 
     return {
         "message": "Flight assigned successfully",
-        "assignment_id": new_assignment.id,
-        "flight_details": {
-            "flight_number": flight.flight_number,
-            "route": f"{flight.origin} → {flight.destination}",
-            "departure": flight.departure_time.strftime('%Y-%m-%d %H:%M'),
-            "arrival": flight.arrival_time.strftime('%Y-%m-%d %H:%M'),
-            "duration": flight.duration_text
-        },
-        "crew_info": {
-            "name": crew.name,
-            "role": crew.role
-        }
+        "assignment_id": assignment_id,
+        "flight_details": flight_details,
+        "crew_info": crew_info
     }
 
 
 @router.delete("/assignment/{assignment_id}")
 def delete_assignment(assignment_id: int, db: Session = Depends(get_db)):
-    assignment = db.query(models.FlightAssignment).filter(
-        models.FlightAssignment.id == assignment_id
-    ).first()
-
-    if not assignment:
+    result = db.execute(
+        delete(models.FlightAssignment).where(models.FlightAssignment.id == assignment_id),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Assignment not found")
 
-    db.delete(assignment)
     db.commit()
+    response_cache.invalidate()
     return {"message": f"Assignment {assignment_id} deleted successfully."}
 
 
-@router.get("/schedules")
-def get_all_schedules(db: Session = Depends(get_db), logger: LoggerService = Depends(get_logger_service)):
+@router.get("/schedules", response_model=List[schemas.ScheduleItem])
+def get_all_schedules(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    logger: LoggerService = Depends(get_logger_service)
+):
     try:
-        assignments = db.query(models.FlightAssignment).join(
-            models.Flight
+        stmt = select(
+            models.FlightAssignment.id,
+            models.CrewMember.id.label("crew_id"),
+            models.CrewMember.name.label("crew_name"),
+            models.Flight.id.label("flight_id"),
+            models.Flight.flight_number,
+            models.Flight.departure_time,
+            models.Flight.arrival_time,
+            func.coalesce(models.Flight.origin, "Unknown").label("origin"),
+            func.coalesce(models.Flight.destination, "Unknown").label("destination"),
+            models.Flight.duration_text
         ).join(
-            models.CrewMember
-        ).filter(
+            models.Flight, models.FlightAssignment.flight_id == models.Flight.id
+        ).join(
+            models.CrewMember, models.FlightAssignment.crew_id == models.CrewMember.id
+        ).where(
             models.FlightAssignment.status == "active"
-        ).all()
-
-        schedule_items = []
-        for assignment in assignments:
-            flight = assignment.flight
-            crew = assignment.crew_member
-            schedule_item = {
-                "id": assignment.id,
-                "crew_id": crew.id,
-                "crew_name": crew.name,
-                "flight_id": flight.id,
-                "flight_number": flight.flight_number,
-                "departure_time": flight.departure_time.isoformat() if flight.departure_time else None,
-                "arrival_time": flight.arrival_time.isoformat() if flight.arrival_time else None,
-                "origin": flight.origin or "Unknown",
-                "destination": flight.destination or "Unknown",
-                "duration_text": flight.duration_text
-            }
-            schedule_items.append(schedule_item)
-        return schedule_items
+        )
+        stmt = _paginate(stmt, models.FlightAssignment.id, limit, offset).execution_options(
+            yield_per=LIST_BATCH_SIZE
+        )
+        return response_cache.get_or_set(
+            ("schedules", limit, offset),
+            lambda: [schemas.ScheduleItem.model_validate(row) for row in db.execute(stmt)]
+        )
 
     except Exception as e:
         logger.error(f"Error fetching schedules: {str(e)}")
@@ -180,11 +232,11 @@ def get_all_schedules(db: Session = Depends(get_db), logger: LoggerService = Dep
 
 @router.get("/crew/{crew_id}/availability-check/{flight_id}")
 def check_crew_availability(crew_id: int, flight_id: int, db: Session = Depends(get_db)):
-    crew = db.query(models.CrewMember).filter(models.CrewMember.id == crew_id).first()
+    crew = db.get(models.CrewMember, crew_id)
     if not crew:
         raise HTTPException(status_code=404, detail="Crew member not found")
 
-    flight = db.query(models.Flight).filter(models.Flight.id == flight_id).first()
+    flight = db.get(models.Flight, flight_id)
     if not flight:
         raise HTTPException(status_code=404, detail="Flight not found")
 
@@ -203,9 +255,9 @@ def check_crew_availability(crew_id: int, flight_id: int, db: Session = Depends(
             "flight_number": flight.flight_number,
             "message": f"Crew member {crew.name} is available for flight {flight.flight_number}",
             "flight_details": {
-                "departure": departure_time.strftime('%Y-%m-%d %H:%M'),
-                "arrival": arrival_time.strftime('%Y-%m-%d %H:%M'),
-                "route": f"{flight.origin} → {flight.destination}",
+                "departure": schemas.format_display_time(departure_time),
+                "arrival": schemas.format_display_time(arrival_time),
+                "route": flight.route,
                 "duration": flight.duration_text
             }
         }
@@ -221,20 +273,72 @@ def check_crew_availability(crew_id: int, flight_id: int, db: Session = Depends(
 
 
 @router.get("/flights", response_model=List[schemas.FlightRead])
-def get_all_flights(db: Session = Depends(get_db)):
-    flights = db.query(models.Flight).all()
-    return flights
+def get_all_flights(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    stmt = select(
+        models.Flight.id,
+        models.Flight.flight_number,
+        models.Flight.origin,
+        models.Flight.destination,
+        models.Flight.direction,
+        models.Flight.duration_minutes,
+        models.Flight.duration_text,
+        models.Flight.departure_time,
+        models.Flight.arrival_time,
+        models.Flight.origin_timezone,
+        models.Flight.destination_timezone,
+        models.Flight.origin_gmt_offset,
+        models.Flight.destination_gmt_offset
+    )
+    stmt = _paginate(stmt, models.Flight.id, limit, offset).execution_options(yield_per=LIST_BATCH_SIZE)
+    return response_cache.get_or_set(
+        ("flights", limit, offset),
+        lambda: [schemas.FlightRead.model_validate(row) for row in db.execute(stmt)]
+    )
+
+
+def _load_flights_job(flight_date: Optional[str], logger: LoggerService) -> None:
+    # runs after the response is sent, so it cannot share the request's session
+    db = SessionLocal()
+    try:
+        added = store_luton_flights(db, flight_date)
+        response_cache.invalidate()
+        logger.info(f"Background load for {flight_date or 'today'} finished. New flights: {added}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Background load for {flight_date or 'today'} failed: {str(e)}")
+    finally:
+        db.close()
 
 
 @router.post("/load-flights")
-def load_flights(db: Session = Depends(get_db), flight_date: str = None, logger: LoggerService = Depends(get_logger_service)):
+def load_flights(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    flight_date: str = None,
+    background: bool = False,
+    logger: LoggerService = Depends(get_logger_service)
+):
+    if background:
+        background_tasks.add_task(_load_flights_job, flight_date, logger)
+        response.status_code = 202
+        return {
+            "message": f"Flight load for {flight_date or 'today'} started in the background",
+            "date": flight_date or "today"
+        }
+
     try:
-        store_luton_flights(db, flight_date)
-        total_flights = db.query(models.Flight).count()
-        logger.info(f"Loaded flights for {flight_date or 'today'}. Total flights: {total_flights}")
+        added = store_luton_flights(db, flight_date)
+        response_cache.invalidate()
+        logger.info(f"Loaded flights for {flight_date or 'today'}. New flights: {added}")
 
         return {
-            "message": f"Flights loaded successfully. Total flights in database: {total_flights}",
+            "message": f"Flights loaded successfully. New flights added: {added}",
+            "added": added,
             "date": flight_date or "today"
         }
     except Exception as e:
@@ -243,7 +347,7 @@ def load_flights(db: Session = Depends(get_db), flight_date: str = None, logger:
 
 @router.get("/flights/{flight_id}", response_model=schemas.FlightRead)
 def get_flight_details(flight_id: int, db: Session = Depends(get_db)):
-    flight = db.query(models.Flight).filter(models.Flight.id == flight_id).first()
+    flight = db.get(models.Flight, flight_id)
     if not flight:
         raise HTTPException(status_code=404, detail="Flight not found")
     return flight
@@ -251,25 +355,33 @@ def get_flight_details(flight_id: int, db: Session = Depends(get_db)):
 
 @router.delete("/flight/{flight_id}")
 def delete_flight(flight_id: int, db: Session = Depends(get_db)):
-    flight = db.query(models.Flight).filter(models.Flight.id == flight_id).first()
-    if not flight:
+    # flight_assignments.flight_id is ON DELETE CASCADE, the database removes the assignments
+    result = db.execute(
+        delete(models.Flight).where(models.Flight.id == flight_id),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Flight not found")
 
-    db.query(models.FlightAssignment).filter(models.FlightAssignment.flight_id == flight.id).delete()
-
-    db.delete(flight)
     db.commit()
+    response_cache.invalidate()
     return {"message": f"Flight {flight_id} and related schedules/assignments deleted."}
 
 
 @router.delete("/flights")
 def delete_all_flights(db: Session = Depends(get_db), logger: LoggerService = Depends(get_logger_service)):
     try:
-        assignments_deleted = db.query(models.FlightAssignment).delete()
+        assignments_deleted = db.execute(
+            delete(models.FlightAssignment), execution_options={"synchronize_session": False}
+        ).rowcount
 
-        flights_deleted = db.query(models.Flight).delete()
+        flights_deleted = db.execute(
+            delete(models.Flight), execution_options={"synchronize_session": False}
+        ).rowcount
 
         db.commit()
+        response_cache.invalidate()
 
         logger.info(f"Deleted {flights_deleted} flights and {assignments_deleted} assignments from database")
 
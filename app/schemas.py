@@ -1,7 +1,23 @@
-from pydantic import BaseModel, computed_field, validator
+from pydantic import BaseModel, ConfigDict, computed_field, field_validator
 from datetime import datetime
 from typing import Optional, List
 
+from .config import BUSINESS_RULES
+
+
+def format_display_time(dt: Optional[datetime]) -> Optional[str]:
+    """
+    'YYYY-MM-DD HH:MM' display string shared by the read schemas and the route responses
+    """
+    # isoformat is ~3x cheaper than strftime('%Y-%m-%d %H:%M') and gives the same
+    # text for the naive datetimes read from the DB; aware values keep strftime
+    # so no "+00:00" suffix leaks into the display strings
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.isoformat(' ', 'minutes')
+    return dt.strftime('%Y-%m-%d %H:%M')
+
 
 class FlightBase(BaseModel):
     flight_number: str
@@ -38,7 +54,7 @@ class FlightRead(FlightBase):
     def departure_display(self) -> Optional[str]:
         if self.departure_time:
             offset = f" {self.origin_gmt_offset}" if self.origin_gmt_offset else ""
-            return f"{self.departure_time.strftime('%Y-%m-%d %H:%M')}{offset}"
+            return f"{format_display_time(self.departure_time)}{offset}"
         return None
 
     @computed_field
@@ -46,11 +62,17 @@ class FlightRead(FlightBase):
     def arrival_display(self) -> Optional[str]:
         if self.arrival_time:
             offset = f" {self.destination_gmt_offset}" if self.destination_gmt_offset else ""
-            return f"{self.arrival_time.strftime('%Y-%m-%d %H:%M')}{offset}"
+            return f"{format_display_time(self.arrival_time)}{offset}"
         return None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+def _check_crew_role(role: Optional[str]) -> Optional[str]:
+    # the UI sends "Pilot" / "Flight attendant"; keep the caller's casing
+    if role is not None and role.lower() not in BUSINESS_RULES.valid_crew_roles:
+        raise ValueError(f"role must be one of: {', '.join(BUSINESS_RULES.valid_crew_roles)}")
+    return role
 
 
 class CrewMemberBase(BaseModel):
@@ -60,7 +82,10 @@ class CrewMemberBase(BaseModel):
 
 
 class CrewMemberCreate(CrewMemberBase):
-    pass
+    @field_validator('role')
+    @classmethod
+    def validate_role(cls, v):
+        return _check_crew_role(v)
 
 
 class CrewMemberUpdate(BaseModel):
@@ -68,12 +93,16 @@ class CrewMemberUpdate(BaseModel):
     role: Optional[str] = None
     is_on_leave: Optional[bool] = None
 
+    @field_validator('role')
+    @classmethod
+    def validate_role(cls, v):
+        return _check_crew_role(v)
+
 
 class CrewMemberRead(CrewMemberBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class CrewMemberSimple(BaseModel):
@@ -82,8 +111,7 @@ class CrewMemberSimple(BaseModel):
     role: str
     is_on_leave: Optional[bool] = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class FlightSimple(BaseModel):
@@ -96,8 +124,7 @@ class FlightSimple(BaseModel):
     arrival_time: Optional[datetime] = None
     duration_text: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class FlightAssignmentBase(BaseModel):
@@ -123,14 +150,14 @@ class FlightAssignmentRead(FlightAssignmentBase):
     @property
     def departure_display(self) -> str:
         if self.flight.departure_time:
-            return self.flight.departure_time.strftime('%Y-%m-%d %H:%M')
+            return format_display_time(self.flight.departure_time)
         return "TBD"
 
     @computed_field
     @property
     def arrival_display(self) -> str:
         if self.flight.arrival_time:
-            return self.flight.arrival_time.strftime('%Y-%m-%d %H:%M')
+            return format_display_time(self.flight.arrival_time)
         return "TBD"
 
     @computed_field
@@ -138,8 +165,7 @@ class FlightAssignmentRead(FlightAssignmentBase):
     def duration_display(self) -> str:
         return self.flight.duration_text or "Unknown"
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class CrewMemberWithAssignments(CrewMemberBase):
@@ -151,8 +177,7 @@ class CrewMemberWithAssignments(CrewMemberBase):
     def active_assignments_count(self) -> int:
         return len([a for a in self.assignments if a.status == "active"])
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class ScheduleItem(BaseModel):
@@ -160,40 +185,25 @@ class ScheduleItem(BaseModel):
     crew_id: int
     crew_name: str
     flight_id: int
-    flight_number: str
+    flight_number: Optional[str]
     departure_time: Optional[datetime]
     arrival_time: Optional[datetime]
     origin: Optional[str]
     destination: Optional[str]
     duration_text: Optional[str]
 
-    @validator('crew_name', pre=True)
-    def validate_crew_name(cls, v):
-        if not v or str(v).isdigit():
-            raise ValueError('crew_name must be a non-empty string, not a number')
-        return str(v)
-
-    @validator('flight_number', pre=True)
-    def validate_flight_number(cls, v):
-        if not v:
-            raise ValueError('flight_number is required')
-        v_str = str(v)
-        if len(v_str) > 10 and '-' in v_str and v_str.count('-') >= 2:
-            raise ValueError('flight_number appears to be corrupted (looks like a date)')
-        return v_str
-
     @computed_field
     @property
     def departure_display(self) -> str:
         if self.departure_time:
-            return self.departure_time.strftime('%Y-%m-%d %H:%M')
+            return format_display_time(self.departure_time)
         return "TBD"
 
     @computed_field
     @property
     def arrival_display(self) -> str:
         if self.arrival_time:
-            return self.arrival_time.strftime('%Y-%m-%d %H:%M')
+            return format_display_time(self.arrival_time)
         return "TBD"
 
     @computed_field
@@ -203,5 +213,4 @@ class ScheduleItem(BaseModel):
         destination = self.destination or "Unknown"
         return f"{origin} → {destination}"
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
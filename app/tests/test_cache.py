@@ -0,0 +1,60 @@
+from unittest.mock import Mock, patch
+
+from app.cache import ResponseCache
+
+
+class TestResponseCache:
+    def setup_method(self):
+        self.cache = ResponseCache(ttl=30.0, maxsize=2)
+
+    def test_hit_within_ttl(self):
+        loader = Mock(return_value=["flight"])
+
+        with patch("app.cache.time.monotonic", return_value=100.0):
+            assert self.cache.get_or_set("flights", loader) == ["flight"]
+        with patch("app.cache.time.monotonic", return_value=129.0):
+            assert self.cache.get_or_set("flights", loader) == ["flight"]
+
+        loader.assert_called_once()
+
+    def test_expired_entry_reloaded(self):
+        loader = Mock(side_effect=[["old"], ["new"]])
+
+        with patch("app.cache.time.monotonic", return_value=100.0):
+            self.cache.get_or_set("flights", loader)
+        with patch("app.cache.time.monotonic", return_value=131.0):
+            assert self.cache.get_or_set("flights", loader) == ["new"]
+
+    def test_invalidate_clears_entries(self):
+        loader = Mock(side_effect=[["old"], ["new"]])
+
+        self.cache.get_or_set("flights", loader)
+        self.cache.invalidate()
+
+        assert self.cache.get_or_set("flights", loader) == ["new"]
+        assert loader.call_count == 2
+
+    def test_load_running_during_invalidate_not_stored(self):
+        def stale_loader():
+            # a write commits and invalidates while this read is still loading
+            self.cache.invalidate()
+            return ["stale"]
+
+        assert self.cache.get_or_set("flights", stale_loader) == ["stale"]
+        assert self.cache.get_or_set("flights", lambda: ["fresh"]) == ["fresh"]
+
+    def test_maxsize_evicts_least_recently_used(self):
+        self.cache.get_or_set("a", lambda: "a")
+        self.cache.get_or_set("b", lambda: "b")
+        self.cache.get_or_set("a", lambda: "unused")
+        self.cache.get_or_set("c", lambda: "c")
+
+        assert self.cache.get_or_set("a", lambda: "reloaded") == "a"
+        assert self.cache.get_or_set("b", lambda: "reloaded") == "reloaded"
+
+    def test_zero_ttl_bypasses_cache(self):
+        cache = ResponseCache(ttl=0)
+        loader = Mock(side_effect=[["first"], ["second"]])
+
+        assert cache.get_or_set("flights", loader) == ["first"]
+        assert cache.get_or_set("flights", loader) == ["second"]
@@ -0,0 +1,35 @@
+import logging
+from unittest.mock import patch
+
+from app.logger_service import DuplicateMessageFilter
+
+
+def make_record(message, level=logging.INFO):
+    return logging.LogRecord("app", level, __file__, 1, message, None, None)
+
+
+class TestDuplicateMessageFilter:
+    def test_repeat_within_ttl_suppressed(self):
+        log_filter = DuplicateMessageFilter(ttl=5.0)
+
+        with patch("app.logger_service.time.monotonic", return_value=100.0):
+            assert log_filter.filter(make_record("Processing flight EZY1"))
+            assert not log_filter.filter(make_record("Processing flight EZY1"))
+        with patch("app.logger_service.time.monotonic", return_value=106.0):
+            assert log_filter.filter(make_record("Processing flight EZY1"))
+
+    def test_errors_always_emitted(self):
+        log_filter = DuplicateMessageFilter(ttl=5.0)
+
+        assert log_filter.filter(make_record("API request failed", logging.ERROR))
+        assert log_filter.filter(make_record("API request failed", logging.ERROR))
+
+    def test_seen_set_bounded_by_maxsize(self):
+        log_filter = DuplicateMessageFilter(ttl=5.0, maxsize=3)
+
+        for i in range(10):
+            log_filter.filter(make_record(f"Processing flight EZY{i}"))
+
+        assert len(log_filter._seen) == 3
+        # the oldest messages were evicted, so they are emitted again
+        assert log_filter.filter(make_record("Processing flight EZY0"))
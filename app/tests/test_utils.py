@@ -1,11 +1,17 @@
 import pytest
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+from sqlalchemy.dialects import mysql
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.utils import (
     calculate_timezone_adjusted_duration,
-    parse_gmt_offset
+    format_gmt_offset,
+    get_gmt_offset_from_timezone,
+    get_zoneinfo,
+    parse_gmt_offset,
+    store_luton_flights
 )
 
 
@@ -24,6 +30,20 @@ class TestTimezoneCalculations:
         assert parse_gmt_offset("") == 0.0
         assert parse_gmt_offset(None) == 0.0
 
+    def test_get_zoneinfo(self):
+        assert get_zoneinfo("Europe/London").key == "Europe/London"
+        assert get_zoneinfo("Invalid/Zone") is None
+        assert get_zoneinfo("") is None
+        assert get_zoneinfo(None) is None
+
+    def test_gmt_offset_formatting(self):
+        assert format_gmt_offset(timedelta(hours=1)) == "GMT+1"
+        assert format_gmt_offset(timedelta(hours=5, minutes=30)) == "GMT+5:30"
+        assert format_gmt_offset(timedelta(hours=-3, minutes=-30)) == "GMT-3:30"
+        assert format_gmt_offset(None) == "GMT+0"
+        assert get_gmt_offset_from_timezone("Europe/Madrid", datetime(2024, 7, 1, 12, 0)) == "GMT+2"
+        assert get_gmt_offset_from_timezone("Europe/Madrid", datetime(2024, 1, 15, 12, 0)) == "GMT+1"
+
     def test_duration_calculation_basic(self):
         # London 10:00 GMT+0 - Barcelona 13:00 GMT+1
         # should be 2 hours (10:00 UTC - 12:00 UTC)
@@ -37,6 +57,19 @@ class TestTimezoneCalculations:
         assert result.minutes == 120
         assert result.text == "2h 0m"
 
+    def test_duration_calculation_timezone_aware(self):
+        # Madrid 16:00 GMT+2 - London 17:30 GMT+1 as converted from the API
+        # should be 2h 30m (14:00 UTC - 16:30 UTC), offsets applied once
+        dep_time = datetime(2024, 7, 1, 14, 0, tzinfo=timezone.utc).astimezone(get_zoneinfo("Europe/Madrid"))
+        arr_time = datetime(2024, 7, 1, 16, 30, tzinfo=timezone.utc).astimezone(get_zoneinfo("Europe/London"))
+
+        result = calculate_timezone_adjusted_duration(
+            dep_time, arr_time, "GMT+2", "GMT+1"
+        )
+
+        assert result.minutes == 150
+        assert result.text == "2h 30m"
+
     def test_duration_calculation_cross_date_new_york_to_london(self):
         # New York 23:00 GMT-5 - London 11:00 GMT+1 (next day)
         # should be 6 hours 23:00 EST (04:00 UTC) - 11:00 BST (10:00 UTC next day)
@@ -114,5 +147,90 @@ class TestTimezoneCalculations:
         assert result.text == "0h 0m"
 
 
+def make_api_flight(flight_number, dep_utc, arr_utc, origin="LTN", destination="BCN",
+                    dep_tz="Europe/London", arr_tz="Europe/Madrid"):
+    return {
+        "flight": {"iata": flight_number},
+        "departure": {"iata": origin, "scheduled": dep_utc, "timezone": dep_tz},
+        "arrival": {"iata": destination, "scheduled": arr_utc, "timezone": arr_tz},
+    }
+
+
+def inserted_flight_numbers(insert_stmt):
+    params = insert_stmt.compile(dialect=mysql.dialect()).params
+    return sorted(v for k, v in params.items() if k.startswith("flight_number"))
+
+
+class TestStoreLutonFlights:
+    def setup_method(self):
+        self.db = Mock()
+        self.insert_result = Mock(rowcount=0)
+
+    def run_store(self, departures, existing_rows=()):
+        # first execute is the existing-flight lookup, the second the bulk insert
+        self.db.execute.side_effect = [list(existing_rows), self.insert_result]
+        payload = {"arrivals": [], "departures": departures}
+        with patch("app.utils.get_luton_flights", return_value=payload):
+            return store_luton_flights(self.db, "2024-07-01")
+
+    def test_existing_flight_skipped(self):
+        # EZY1 departs 09:00 London time, already stored for that day
+        existing = [("EZY1", "departure", datetime(2024, 7, 1, 9, 0))]
+        self.insert_result.rowcount = 1
+
+        added = self.run_store([
+            make_api_flight("EZY1", "2024-07-01T08:00:00Z", "2024-07-01T10:15:00Z"),
+            make_api_flight("EZY2", "2024-07-01T12:00:00Z", "2024-07-01T14:15:00Z"),
+        ], existing)
+
+        assert added == 1
+        insert_stmt = self.db.execute.call_args_list[1].args[0]
+        assert inserted_flight_numbers(insert_stmt) == ["EZY2"]
+        self.db.commit.assert_called_once()
+
+    def test_duplicate_in_response_inserted_once(self):
+        self.insert_result.rowcount = 1
+
+        added = self.run_store([
+            make_api_flight("EZY1", "2024-07-01T08:00:00Z", "2024-07-01T10:15:00Z"),
+            make_api_flight("EZY1", "2024-07-01T08:00:00Z", "2024-07-01T10:15:00Z"),
+        ])
+
+        assert added == 1
+        insert_stmt = self.db.execute.call_args_list[1].args[0]
+        assert inserted_flight_numbers(insert_stmt) == ["EZY1"]
+
+    def test_existing_lookup_limited_to_batch_days(self):
+        self.insert_result.rowcount = 1
+
+        self.run_store([make_api_flight("EZY1", "2024-07-01T08:00:00Z", "2024-07-01T10:15:00Z")])
+
+        lookup_stmt = self.db.execute.call_args_list[0].args[0]
+        params = lookup_stmt.compile(dialect=mysql.dialect()).params
+        assert datetime(2024, 7, 1) in params.values()
+        assert datetime(2024, 7, 2) in params.values()
+
+    def test_added_count_excludes_concurrently_stored_rows(self):
+        # 2 rows queued: one inserted (1) and one updated by the duplicate-key clause (2)
+        self.insert_result.rowcount = 3
+
+        added = self.run_store([
+            make_api_flight("EZY1", "2024-07-01T08:00:00Z", "2024-07-01T10:15:00Z"),
+            make_api_flight("EZY2", "2024-07-01T12:00:00Z", "2024-07-01T14:15:00Z"),
+        ])
+
+        assert added == 1
+
+    def test_invalid_records_not_stored(self):
+        added = self.run_store([
+            make_api_flight("EZY1", "2024-07-01T10:00:00Z", "2024-07-01T09:00:00Z"),
+            make_api_flight(None, "2024-07-01T08:00:00Z", "2024-07-01T10:15:00Z"),
+        ])
+
+        assert added == 0
+        self.db.execute.assert_not_called()
+        self.db.commit.assert_called_once()
+
+
 if __name__ == "__main__":
     pytest.main([__file__ + "::TestLutonFlightSequence::test_duplicate_luton_departure_blocked", "-v"])
\ No newline at end of file
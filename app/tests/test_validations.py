@@ -1,15 +1,18 @@
+import itertools
 import pytest
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from unittest.mock import Mock
 from fastapi import HTTPException
 
 from app.validations import (
     validate_luton_flight_sequence,
     check_flight_time_conflict,
-    flight_assignment_validation
+    flight_assignment_validation,
+    validate_crew_limits_per_flight
 )
-from app import models
 from app.config import BusinessRules
+from app.schemas import ScheduleItem
 
 
 class TestLutonFlightSequence:
@@ -17,28 +20,30 @@ class TestLutonFlightSequence:
         self.db = Mock()
         self.crew_id = 1
         self.base_date = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        self._flight_ids = itertools.count(1)
 
     def create_mock_flight(self, flight_number, direction, origin, destination,
                            departure_time, arrival_time):
-        flight = Mock(spec=models.Flight)
-        flight.id = hash(flight_number) % 1000
-        flight.flight_number = flight_number
-        flight.direction = direction
-        flight.origin = origin
-        flight.destination = destination
-        flight.departure_time = departure_time
-        flight.arrival_time = arrival_time
-        return flight
+        return SimpleNamespace(
+            id=next(self._flight_ids),
+            flight_number=flight_number,
+            direction=direction,
+            origin=origin,
+            destination=destination,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        )
 
     def create_mock_assignment(self, flight):
-        assignment = Mock(spec=models.FlightAssignment)
-        assignment.flight = flight
-        assignment.crew_id = self.crew_id
-        assignment.status = "active"
-        return assignment
+        return SimpleNamespace(
+            flight=flight,
+            flight_id=flight.id,
+            crew_id=self.crew_id,
+            status="active",
+        )
 
     def test_single_luton_departure_allowed(self):
-        self.db.query.return_value.join.return_value.filter.return_value.all.return_value = []
+        self.db.scalars.return_value.all.return_value = []
 
         new_flight = self.create_mock_flight(
             "EZY123", "departure", "LTN", "BCN",
@@ -59,7 +64,7 @@ class TestLutonFlightSequence:
         )
         existing_assignment = self.create_mock_assignment(existing_flight)
 
-        self.db.query.return_value.join.return_value.filter.return_value.all.return_value = [existing_assignment]
+        self.db.scalars.return_value.all.return_value = [existing_assignment]
 
         new_flight = self.create_mock_flight(
             "EZY789", "departure", "LTN", "BCN",
@@ -84,7 +89,7 @@ class TestLutonFlightSequence:
         )
         existing_assignment = self.create_mock_assignment(existing_departure)
 
-        self.db.query.return_value.join.return_value.filter.return_value.all.return_value = [existing_assignment]
+        self.db.scalars.return_value.all.return_value = [existing_assignment]
 
         new_arrival = self.create_mock_flight(
             "EZY124", "arrival", "MAD", "LTN",
@@ -109,7 +114,7 @@ class TestLutonFlightSequence:
         )
         existing_assignment = self.create_mock_assignment(existing_departure)
 
-        self.db.query.return_value.join.return_value.filter.return_value.all.return_value = [existing_assignment]
+        self.db.scalars.return_value.all.return_value = [existing_assignment]
 
         new_arrival = self.create_mock_flight(
             "EZY124", "arrival", "BCN", "LTN",
@@ -122,6 +127,30 @@ class TestLutonFlightSequence:
             new_arrival.departure_time, new_arrival.arrival_time
         )
 
+    def test_preloaded_assignments_skip_query(self):
+        existing_flight = self.create_mock_flight(
+            "EZY456", "departure", "LTN", "MAD",
+            self.base_date.replace(hour=6),
+            self.base_date.replace(hour=8)
+        )
+        existing_assignment = self.create_mock_assignment(existing_flight)
+
+        new_flight = self.create_mock_flight(
+            "EZY789", "departure", "LTN", "BCN",
+            self.base_date.replace(hour=10),
+            self.base_date.replace(hour=12)
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            validate_luton_flight_sequence(
+                self.db, self.crew_id, new_flight,
+                new_flight.departure_time, new_flight.arrival_time,
+                existing_assignments=[existing_assignment]
+            )
+
+        assert exc_info.value.status_code == 409
+        self.db.scalars.assert_not_called()
+
 
 class TestFlightTimeConflicts:
     def setup_method(self):
@@ -130,14 +159,12 @@ class TestFlightTimeConflicts:
         self.base_date = datetime(2024, 1, 15, tzinfo=timezone.utc)
 
     def create_mock_assignment_with_times(self, dep_hour, arr_hour):
-        flight = Mock()
-        flight.flight_number = "TEST123"
-        flight.departure_time = self.base_date.replace(hour=dep_hour)
-        flight.arrival_time = self.base_date.replace(hour=arr_hour)
-
-        assignment = Mock()
-        assignment.flight = flight
-        return assignment
+        flight = SimpleNamespace(
+            flight_number="TEST123",
+            departure_time=self.base_date.replace(hour=dep_hour),
+            arrival_time=self.base_date.replace(hour=arr_hour),
+        )
+        return SimpleNamespace(flight=flight)
 
     def test_no_conflict_sufficient_buffer(self):
         existing = self.create_mock_assignment_with_times(8, 10)
@@ -195,27 +222,29 @@ class TestFlightAssignmentValidation:
         self.crew_id = 1
         self.base_date = datetime(2024, 1, 15, tzinfo=timezone.utc)
 
-        self.mock_crew = Mock()
-        self.mock_crew.id = self.crew_id
-        self.mock_crew.name = "Test Pilot"
-        self.mock_crew.role = "pilot"
+        self.mock_crew = SimpleNamespace(id=self.crew_id, name="Test Pilot", role="pilot")
 
-        self.mock_flight = Mock()
-        self.mock_flight.id = 100
-        self.mock_flight.flight_number = "EZY123"
-        self.mock_flight.direction = "departure"
-        self.mock_flight.origin = "LTN"
-        self.mock_flight.destination = "BCN"
-        self.mock_flight.departure_time = self.base_date.replace(hour=8)
-        self.mock_flight.arrival_time = self.base_date.replace(hour=10)
+        self.mock_flight = SimpleNamespace(
+            id=100,
+            flight_number="EZY123",
+            direction="departure",
+            origin="LTN",
+            destination="BCN",
+            departure_time=self.base_date.replace(hour=8),
+            arrival_time=self.base_date.replace(hour=10),
+        )
 
     def test_duplicate_assignment_blocked(self):
-        existing_assignment = Mock()
-        existing_assignment.crew_id = self.crew_id
-        existing_assignment.flight_id = self.mock_flight.id
-        existing_assignment.status = "active"
+        existing_assignment = SimpleNamespace(
+            crew_id=self.crew_id,
+            flight_id=self.mock_flight.id,
+            status="active",
+            flight=self.mock_flight,
+        )
 
-        self.db.query.return_value.filter.return_value.first.return_value = existing_assignment
+        self.db.scalars.return_value.all.return_value = [
+            existing_assignment
+        ]
 
         with pytest.raises(HTTPException) as exc_info:
             flight_assignment_validation(
@@ -231,22 +260,21 @@ class TestFlightAssignmentValidation:
 
         with patch('app.validations.validate_luton_flight_sequence'):
 
-            self.db.query.return_value.filter.return_value.first.return_value = None
-
-            existing_flight1 = Mock()
-            existing_flight1.departure_time = self.base_date.replace(hour=6)
-            existing_flight1.arrival_time = self.base_date.replace(hour=8)
-
-            existing_flight2 = Mock()
-            existing_flight2.departure_time = self.base_date.replace(hour=14)
-            existing_flight2.arrival_time = self.base_date.replace(hour=16)
+            existing_flight1 = SimpleNamespace(
+                id=101,
+                departure_time=self.base_date.replace(hour=6),
+                arrival_time=self.base_date.replace(hour=8),
+            )
+            existing_flight2 = SimpleNamespace(
+                id=102,
+                departure_time=self.base_date.replace(hour=14),
+                arrival_time=self.base_date.replace(hour=16),
+            )
 
-            assignment1 = Mock()
-            assignment1.flight = existing_flight1
-            assignment2 = Mock()
-            assignment2.flight = existing_flight2
+            assignment1 = SimpleNamespace(flight_id=existing_flight1.id, flight=existing_flight1)
+            assignment2 = SimpleNamespace(flight_id=existing_flight2.id, flight=existing_flight2)
 
-            self.db.query.return_value.join.return_value.filter.return_value.order_by.return_value.all.return_value = [
+            self.db.scalars.return_value.all.return_value = [
                 assignment1, assignment2
             ]
 
@@ -258,3 +286,38 @@ class TestFlightAssignmentValidation:
 
             assert exc_info.value.status_code == 409
             assert "already has 2 flights scheduled" in exc_info.value.detail
+
+    def test_pilot_limit_per_flight(self):
+        self.db.execute.return_value.all.return_value = [("pilot", 2), ("flight attendant", 1)]
+
+        with pytest.raises(HTTPException) as exc_info:
+            validate_crew_limits_per_flight(self.db, self.mock_flight, "Pilot")
+
+        assert exc_info.value.status_code == 409
+        assert "already has 2 pilots assigned" in exc_info.value.detail
+
+        validate_crew_limits_per_flight(self.db, self.mock_flight, "Flight attendant")
+
+
+class TestScheduleItem:
+    def test_numeric_crew_name_serialises(self):
+        # crew names are free text, so GET /schedules must accept an all-digit one
+        item = ScheduleItem(
+            id=1, crew_id=1, crew_name="007", flight_id=1, flight_number="EZY1",
+            departure_time=None, arrival_time=None, origin="LTN", destination="BCN",
+            duration_text=None
+        )
+
+        assert item.crew_name == "007"
+        assert item.departure_display == "TBD"
+
+    def test_null_flight_number_serialises(self):
+        # flights.flight_number is nullable, a NULL must not fail GET /schedules
+        item = ScheduleItem(
+            id=1, crew_id=1, crew_name="Test Pilot", flight_id=1, flight_number=None,
+            departure_time=None, arrival_time=None, origin="LTN", destination="BCN",
+            duration_text=None
+        )
+
+        assert item.flight_number is None
+        assert item.route_display == "LTN → BCN"
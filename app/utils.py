@@ -1,7 +1,12 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import os
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
@@ -10,8 +15,9 @@ from app import models
 from .data_structures import DurationResult
 from .config import ApiConfig
 from .logger_service import LoggerService
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -20,21 +26,60 @@ API_KEY = os.getenv("API_KEY")
 api_config = ApiConfig()
 logger = LoggerService(__name__)
 
+# shared session so repeated AviationStack calls reuse the pooled TCP/TLS connection,
+# retrying (GET only) on connection errors and gateway failures
+_http_retry = Retry(
+    total=api_config.max_retries,
+    backoff_factor=api_config.retry_backoff_seconds,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False
+)
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=_http_retry))
+http_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=_http_retry))
 
-def get_gmt_offset_from_timezone(tz_name: str, ref_time: datetime = None) -> str:
+
+# DurationResult is immutable, so every failed calculation can share one instance
+_INVALID_DURATION = DurationResult(0, "0h 0m", False)
+
+
+@lru_cache(maxsize=64)
+def get_zoneinfo(tz_name: str) -> Optional[ZoneInfo]:
+    """
+    Resolve an IANA timezone name to a ZoneInfo object, returning None for empty or unknown names.
+    Results are cached so each zone is only loaded the first time a flight uses it
+    """
+    if not tz_name:
+        return None
     try:
-        ref_time = ref_time or datetime.utcnow()
-        tz = ZoneInfo(tz_name)
-        local_time = ref_time.astimezone(tz)
-        offset = local_time.utcoffset()
+        return ZoneInfo(tz_name)
+    except Exception:
+        return None
+
 
-        if offset is None:
-            return "GMT+0"
+@lru_cache(maxsize=64)
+def format_gmt_offset(offset: Optional[timedelta]) -> str:
+    """
+    Format a UTC offset as 'GMT+1' / 'GMT+5:30'. Only a few dozen offsets exist,
+    so the formatted strings are cached per offset
+    """
+    if offset is None:
+        return "GMT+0"
 
-        total_minutes = int(offset.total_seconds() // 60)
-        hours, minutes = divmod(abs(total_minutes), 60)
-        sign = "+" if total_minutes >= 0 else "-"
-        return f"GMT{sign}{hours}" if minutes == 0 else f"GMT{sign}{hours}:{minutes:02d}"
+    total_minutes = int(offset.total_seconds() // 60)
+    hours, minutes = divmod(abs(total_minutes), 60)
+    sign = "+" if total_minutes >= 0 else "-"
+    return f"GMT{sign}{hours}" if minutes == 0 else f"GMT{sign}{hours}:{minutes:02d}"
+
+
+def get_gmt_offset_from_timezone(tz_name: str, ref_time: datetime = None) -> str:
+    try:
+        ref_time = ref_time or datetime.utcnow()
+        tz = get_zoneinfo(tz_name)
+        if tz is None:
+            raise ValueError(f"unknown timezone '{tz_name}'")
+        return format_gmt_offset(ref_time.astimezone(tz).utcoffset())
     except Exception as e:
         logger.error(f"Failed to resolve GMT offset for '{tz_name}': {e}")
         return "GMT+0"
@@ -45,19 +90,19 @@ def parse_aviationstack_timestamp(timestamp: str, timezone_name: str = None):
         return None, None, None
 
     try:
-        if timestamp.endswith("Z"):
-            dt_utc = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-        else:
-            dt_utc = datetime.fromisoformat(timestamp)
+        # fromisoformat accepts a trailing "Z" since Python 3.11
+        dt_utc = datetime.fromisoformat(timestamp)
 
         if dt_utc.tzinfo is None:
             dt_utc = dt_utc.replace(tzinfo=timezone.utc)
 
         if timezone_name:
             try:
-                local_tz = ZoneInfo(timezone_name)
+                local_tz = get_zoneinfo(timezone_name)
+                if local_tz is None:
+                    raise ValueError(f"unknown timezone '{timezone_name}'")
                 dt_local = dt_utc.astimezone(local_tz)
-                gmt_offset = get_gmt_offset_from_timezone(timezone_name, dt_local)
+                gmt_offset = format_gmt_offset(dt_local.utcoffset())
 
                 logger.debug(f"[TIMEZONE] {timestamp} UTC → {dt_local.strftime('%Y-%m-%d %H:%M')} {gmt_offset} ({timezone_name})")
                 return dt_local, timezone_name, gmt_offset
@@ -72,6 +117,7 @@ def parse_aviationstack_timestamp(timestamp: str, timezone_name: str = None):
         return None, None, None
 
 
+@lru_cache(maxsize=256)
 def parse_gmt_offset(offset_str):
     if not offset_str or not offset_str.startswith("GMT"):
         return 0.0
@@ -85,6 +131,23 @@ def parse_gmt_offset(offset_str):
     return total_hours if sign == '+' else -total_hours
 
 
+@lru_cache(maxsize=4096)
+def format_duration(total_minutes: int) -> str:
+    # flight lengths repeat across loads, so each "Xh Ym" string is built once
+    hours, minutes = divmod(total_minutes, 60)
+    return f"{hours}h {minutes}m"
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _wall_clock_minutes(dt: datetime) -> int:
+    """
+    Minutes since 0001-01-01 for the local wall-clock reading of dt (tzinfo is ignored)
+    """
+    return dt.toordinal() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+
+
 def calculate_timezone_adjusted_duration(
     dep_time: datetime,
     arr_time: datetime,
@@ -95,59 +158,56 @@ def calculate_timezone_adjusted_duration(
     Calculate the actual flight duration by converting both times to UTC and calculating the difference
     """
     if not dep_time or not arr_time:
-        return DurationResult(0, "0h 0m", False)
+        return _INVALID_DURATION
 
     try:
-        logger.debug(f"Departure: {dep_time.strftime('%Y-%m-%d %H:%M')} {origin_gmt_offset}")
-        logger.debug(f"Arrival: {arr_time.strftime('%Y-%m-%d %H:%M')} {destination_gmt_offset}")
-
-        # GMT to hours
-        origin_offset_hours = parse_gmt_offset(origin_gmt_offset)
-        dest_offset_hours = parse_gmt_offset(destination_gmt_offset)
-
-        logger.debug(f"Origin GMT offset: {origin_offset_hours} hours")
-        logger.debug(f"Destination GMT offset: {dest_offset_hours} hours")
-
-        # local times to UTC
-        dep_utc = dep_time - timedelta(hours=origin_offset_hours)
-        arr_utc = arr_time - timedelta(hours=dest_offset_hours)
+        # strftime runs while building the message, so only pay for it when debugging
+        if logger.is_debug_enabled():
+            logger.debug(f"Departure: {dep_time.strftime('%Y-%m-%d %H:%M')} {origin_gmt_offset}")
+            logger.debug(f"Arrival: {arr_time.strftime('%Y-%m-%d %H:%M')} {destination_gmt_offset}")
+
+        if origin_gmt_offset == destination_gmt_offset:
+            # same offset at both ends, the local difference is already the UTC one
+            actual_duration_minutes = _wall_clock_minutes(arr_time) - _wall_clock_minutes(dep_time)
+        else:
+            # GMT to hours
+            origin_offset_hours = parse_gmt_offset(origin_gmt_offset)
+            dest_offset_hours = parse_gmt_offset(destination_gmt_offset)
 
-        # handling cross date flights (if arrival is next day)
-        if arr_time.date() > dep_time.date():
-            local_duration = arr_time - dep_time
-            utc_duration = arr_utc - dep_utc
+            logger.debug(f"Origin GMT offset: {origin_offset_hours} hours")
+            logger.debug(f"Destination GMT offset: {dest_offset_hours} hours")
 
-            local_hours = local_duration.total_seconds() / 3600
-            utc_hours = utc_duration.total_seconds() / 3600
+            # local wall-clock times to UTC, in whole minutes
+            dep_utc = _wall_clock_minutes(dep_time) - round(origin_offset_hours * 60)
+            arr_utc = _wall_clock_minutes(arr_time) - round(dest_offset_hours * 60)
 
-            if 5 <= local_hours <= 12 and utc_hours > 20:
-                # if too much time added, subtract a day
-                arr_utc -= timedelta(days=1)
-            elif 5 <= local_hours <= 12 and utc_hours < 3:
-                # if too little time, add a day  
-                arr_utc += timedelta(days=1)
+            # handling cross date flights (if arrival is next day)
+            if arr_time.toordinal() > dep_time.toordinal():
+                local_minutes = _wall_clock_minutes(arr_time) - _wall_clock_minutes(dep_time)
+                utc_minutes = arr_utc - dep_utc
 
-        logger.debug(f"Departure UTC: {dep_utc.strftime('%Y-%m-%d %H:%M')} UTC")
-        logger.debug(f"Arrival UTC: {arr_utc.strftime('%Y-%m-%d %H:%M')} UTC")
+                if 300 <= local_minutes <= 720 and utc_minutes > 1200:
+                    # if too much time added, subtract a day
+                    arr_utc -= MINUTES_PER_DAY
+                elif 300 <= local_minutes <= 720 and utc_minutes < 180:
+                    # if too little time, add a day
+                    arr_utc += MINUTES_PER_DAY
 
-        # actual flight duration in UTC
-        actual_duration_minutes = int((arr_utc - dep_utc).total_seconds() // 60)
+            # actual flight duration in UTC
+            actual_duration_minutes = arr_utc - dep_utc
 
         logger.debug(f"Actual flight duration: {actual_duration_minutes} minutes")
 
         if actual_duration_minutes <= 0:
             logger.warning(f"Invalid duration: {actual_duration_minutes} minutes")
-            return DurationResult(0, "0h 0m", False)
+            return _INVALID_DURATION
 
         # flights shouldn't be longer than configured max hours (20)
         if actual_duration_minutes > api_config.max_flight_duration_hours * 60:
             logger.warning(f"Unrealistic duration: {actual_duration_minutes} minutes (>{actual_duration_minutes//60} hours)")
-            return DurationResult(0, "0h 0m", False)
+            return _INVALID_DURATION
 
-        # convert to hours and minutes
-        hours = actual_duration_minutes // 60
-        minutes = actual_duration_minutes % 60
-        duration_text = f"{hours}h {minutes}m"
+        duration_text = format_duration(actual_duration_minutes)
 
         logger.debug(f"Final duration result: {duration_text}")
 
@@ -155,7 +215,7 @@ def calculate_timezone_adjusted_duration(
 
     except Exception as e:
         logger.error(f"[DURATION] Calculation error: {e}")
-        return DurationResult(0, "0h 0m", False)
+        return _INVALID_DURATION
 
 
 def calculate_realistic_flight_duration(dep_local: datetime, arr_local: datetime, 
@@ -164,6 +224,10 @@ def calculate_realistic_flight_duration(dep_local: datetime, arr_local: datetime
 
 
 def debug_flight_times(flight_data, direction):
+    # only re-parses the raw timestamps for the debug log, skip it all otherwise
+    if not logger.is_debug_enabled():
+        return
+
     flight_info = flight_data.get("flight", {})
     flight_number = flight_info.get("iata", "UNKNOWN")
 
@@ -190,18 +254,19 @@ def debug_flight_times(flight_data, direction):
     logger.debug("=" * 50)
 
 
-def fetch_arrivals_by_airport(airport_iata: str, date_from: str = None, date_to: str = None):
-    params = {
-        "access_key": API_KEY,
-        "arr_iata": airport_iata,
-    }
+def _fetch_flights(airport_filter: dict, date_from: str = None, date_to: str = None):
+    params = {"access_key": API_KEY, **airport_filter}
     if date_from:
         params["flight_date"] = date_from
     if date_to:
         params["flight_date_to"] = date_to
 
     try:
-        resp = requests.get(api_config.base_url, params=params)
+        resp = http_session.get(
+            api_config.base_url,
+            params=params,
+            timeout=(api_config.connect_timeout_seconds, api_config.read_timeout_seconds)
+        )
         resp.raise_for_status()
         data = resp.json()
 
@@ -213,163 +278,213 @@ def fetch_arrivals_by_airport(airport_iata: str, date_from: str = None, date_to:
         raise Exception(f"API request failed: {e}")
 
 
-def fetch_departures_by_airport(airport_iata: str, date_from: str = None, date_to: str = None):
-    params = {
-        "access_key": API_KEY,
-        "dep_iata": airport_iata,
-    }
-    if date_from:
-        params["flight_date"] = date_from
-    if date_to:
-        params["flight_date_to"] = date_to
-
-    try:
-        resp = requests.get(api_config.base_url, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+def fetch_arrivals_by_airport(airport_iata: str, date_from: str = None, date_to: str = None):
+    return _fetch_flights({"arr_iata": airport_iata}, date_from, date_to)
 
-        if "data" not in data:
-            raise Exception(f"Unexpected response format: {data}")
 
-        return data["data"]
-    except requests.RequestException as e:
-        raise Exception(f"API request failed: {e}")
+def fetch_departures_by_airport(airport_iata: str, date_from: str = None, date_to: str = None):
+    return _fetch_flights({"dep_iata": airport_iata}, date_from, date_to)
 
 
 def get_luton_flights(flight_date: str = None):
-    return {
-        "arrivals": fetch_arrivals_by_airport(api_config.airport_code, date_from=flight_date),
-        "departures": fetch_departures_by_airport(api_config.airport_code, date_from=flight_date)
-    }
-
-
-def store_luton_flights(db: Session, flight_date: str = None):
-    flights = get_luton_flights(flight_date=flight_date)
-
-    def process_flight_record(flight, direction):
-        departure_data = flight.get("departure", {})
-        arrival_data = flight.get("arrival", {})
-        flight_info = flight.get("flight", {})
-        flight_number = flight_info.get("iata") or flight_info.get("icao")
-
-        if not flight_number:
-            logger.warning("Skipping flight - no flight number")
-            return
-
-        logger.info(f"Processing {direction} flight {flight_number}")
-        logger.debug(f"Route: {departure_data.get('iata')} → {arrival_data.get('iata')}")
-
-        dep_timezone = departure_data.get("timezone")
-        arr_timezone = arrival_data.get("timezone")
-
-        logger.debug(f"Raw timezones from API: dep='{dep_timezone}', arr='{arr_timezone}'")
-
-        dep_scheduled_time = departure_data.get("scheduled")
-        dep_actual_time = departure_data.get("actual")
-        arr_scheduled_time = arrival_data.get("scheduled")
-        arr_actual_time = arrival_data.get("actual")
-
-        dep_time_to_use = dep_actual_time or dep_scheduled_time
-        arr_time_to_use = arr_actual_time or arr_scheduled_time
-
-        if not dep_time_to_use or not arr_time_to_use:
-            logger.warning("Skipping - missing critical time data")
-            return
+    # the two requests are independent, so run them side by side on the pooled session
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        arrivals = executor.submit(fetch_arrivals_by_airport, api_config.airport_code, date_from=flight_date)
+        departures = executor.submit(fetch_departures_by_airport, api_config.airport_code, date_from=flight_date)
+        return {
+            "arrivals": arrivals.result(),
+            "departures": departures.result()
+        }
 
-        # parse UTC timestamps from API
-        dep_utc = datetime.fromisoformat(dep_time_to_use.replace("Z", "+00:00"))
-        arr_utc = datetime.fromisoformat(arr_time_to_use.replace("Z", "+00:00"))
 
-        if dep_utc.tzinfo is None:
-            dep_utc = dep_utc.replace(tzinfo=timezone.utc)
-        if arr_utc.tzinfo is None:
-            arr_utc = arr_utc.replace(tzinfo=timezone.utc)
+def _build_flight_row(flight: dict, direction: str) -> Optional[dict]:
+    """
+    Turn one AviationStack record into a flights table row, or None if it is unusable
+    """
+    departure_data = flight.get("departure", {})
+    arrival_data = flight.get("arrival", {})
+    flight_info = flight.get("flight", {})
+    flight_number = flight_info.get("iata") or flight_info.get("icao")
+
+    if not flight_number:
+        logger.warning("Skipping flight - no flight number")
+        return
+
+    if len(flight_number) > 10 and flight_number.count("-") >= 2:
+        logger.warning(f"Skipping flight - flight number {flight_number} looks like a date")
+        return
+
+    logger.info(f"Processing {direction} flight {flight_number}")
+    logger.debug(f"Route: {departure_data.get('iata')} → {arrival_data.get('iata')}")
+
+    dep_timezone = departure_data.get("timezone")
+    arr_timezone = arrival_data.get("timezone")
+
+    logger.debug(f"Raw timezones from API: dep='{dep_timezone}', arr='{arr_timezone}'")
+
+    dep_scheduled_time = departure_data.get("scheduled")
+    dep_actual_time = departure_data.get("actual")
+    arr_scheduled_time = arrival_data.get("scheduled")
+    arr_actual_time = arrival_data.get("actual")
+
+    dep_time_to_use = dep_actual_time or dep_scheduled_time
+    arr_time_to_use = arr_actual_time or arr_scheduled_time
+
+    if not dep_time_to_use or not arr_time_to_use:
+        logger.warning("Skipping - missing critical time data")
+        return
+
+    # parse UTC timestamps from API ("Z" suffix is handled natively on 3.11+)
+    dep_utc = datetime.fromisoformat(dep_time_to_use)
+    arr_utc = datetime.fromisoformat(arr_time_to_use)
+
+    if dep_utc.tzinfo is None:
+        dep_utc = dep_utc.replace(tzinfo=timezone.utc)
+    if arr_utc.tzinfo is None:
+        arr_utc = arr_utc.replace(tzinfo=timezone.utc)
+
+    # convert to local timezones and get GMT
+    dep_gmt_offset = "GMT+0"
+    arr_gmt_offset = "GMT+0"
+    dep_parsed = dep_utc
+    arr_parsed = arr_utc
+    final_dep_timezone = dep_timezone or "UTC"
+    final_arr_timezone = arr_timezone or "UTC"
+
+    if dep_timezone:
+        try:
+            dep_tz = get_zoneinfo(dep_timezone)
+            if dep_tz is None:
+                raise ValueError(f"unknown timezone '{dep_timezone}'")
+            dep_parsed = dep_utc.astimezone(dep_tz)
+            dep_gmt_offset = format_gmt_offset(dep_parsed.utcoffset())
+            if logger.is_debug_enabled():
+                logger.debug(f"Departure: {dep_utc.strftime('%H:%M UTC')} → {dep_parsed.strftime('%H:%M')} {dep_gmt_offset}")
+        except Exception as e:
+            logger.warning(f"Failed to convert departure timezone: {e}")
+            final_dep_timezone = "UTC"
+
+    if arr_timezone:
+        try:
+            arr_tz = get_zoneinfo(arr_timezone)
+            if arr_tz is None:
+                raise ValueError(f"unknown timezone '{arr_timezone}'")
+            arr_parsed = arr_utc.astimezone(arr_tz)
+            arr_gmt_offset = format_gmt_offset(arr_parsed.utcoffset())
+            if logger.is_debug_enabled():
+                logger.debug(f"Arrival: {arr_utc.strftime('%H:%M UTC')} → {arr_parsed.strftime('%H:%M')} {arr_gmt_offset}")
+        except Exception as e:
+            logger.warning(f"Failed to convert arrival timezone: {e}")
+            final_arr_timezone = "UTC"
+
+    # the local times are the same instants as the parsed UTC ones, compare those directly
+    if arr_utc <= dep_utc:
+        logger.error(f"Arrival UTC ({arr_utc}) ≤ Departure UTC ({dep_utc})")
+        debug_flight_times(flight, direction)
+        return
+
+    duration_result = calculate_timezone_adjusted_duration(
+        dep_parsed, arr_parsed, dep_gmt_offset, arr_gmt_offset
+    )
 
-        # convert to local timezones and get GMT
-        dep_gmt_offset = "GMT+0"
-        arr_gmt_offset = "GMT+0"
-        dep_parsed = dep_utc
-        arr_parsed = arr_utc
-        final_dep_timezone = dep_timezone or "UTC"
-        final_arr_timezone = arr_timezone or "UTC"
+    if not duration_result.is_valid or duration_result.minutes > 12 * 60:
+        logger.warning(f"Invalid duration: {duration_result.minutes} minutes")
+        debug_flight_times(flight, direction)
+        return
 
-        if dep_timezone:
-            try:
-                dep_tz = ZoneInfo(dep_timezone)
-                dep_parsed = dep_utc.astimezone(dep_tz)
-                dep_gmt_offset = get_gmt_offset_from_timezone(dep_timezone, dep_parsed)
-                logger.debug(f"Departure: {dep_utc.strftime('%H:%M UTC')} → {dep_parsed.strftime('%H:%M')} {dep_gmt_offset}")
-            except Exception as e:
-                logger.warning(f"Failed to convert departure timezone: {e}")
-                final_dep_timezone = "UTC"
+    origin_iata = departure_data.get("iata")
+    destination_iata = arrival_data.get("iata")
 
-        if arr_timezone:
-            try:
-                arr_tz = ZoneInfo(arr_timezone)
-                arr_parsed = arr_utc.astimezone(arr_tz)
-                arr_gmt_offset = get_gmt_offset_from_timezone(arr_timezone, arr_parsed)
-                logger.debug(f"Arrival: {arr_utc.strftime('%H:%M UTC')} → {arr_parsed.strftime('%H:%M')} {arr_gmt_offset}")
-            except Exception as e:
-                logger.warning(f"Failed to convert arrival timezone: {e}")
-                final_arr_timezone = "UTC"
+    logger.debug(f"Prepared: {duration_result.text} ({origin_iata} {dep_gmt_offset} → {destination_iata} {arr_gmt_offset})")
 
-        dep_utc_check = dep_parsed.astimezone(timezone.utc)
-        arr_utc_check = arr_parsed.astimezone(timezone.utc)
+    return {
+        "flight_number": flight_number,
+        "origin": origin_iata,
+        "destination": destination_iata,
+        "direction": direction,
+        "duration_minutes": duration_result.minutes,
+        "duration_text": duration_result.text,
+        "departure_time": dep_parsed,
+        "arrival_time": arr_parsed,
+        "origin_timezone": final_dep_timezone,
+        "destination_timezone": final_arr_timezone,
+        "origin_gmt_offset": dep_gmt_offset,
+        "destination_gmt_offset": arr_gmt_offset
+    }
 
-        if arr_utc_check <= dep_utc_check:
-            logger.error(f"Arrival UTC ({arr_utc_check}) ≤ Departure UTC ({dep_utc_check})")
-            debug_flight_times(flight, direction)
-            return
 
-        duration_result = calculate_timezone_adjusted_duration(
-            dep_parsed, arr_parsed, dep_gmt_offset, arr_gmt_offset
-        )
+def store_luton_flights(db: Session, flight_date: str = None) -> int:
+    flights = get_luton_flights(flight_date=flight_date)
 
-        if not duration_result.is_valid or duration_result.minutes > 12 * 60:
-            logger.warning(f"Invalid duration: {duration_result.minutes} minutes")
-            debug_flight_times(flight, direction)
-            return
-
-        origin_iata = departure_data.get("iata")
-        destination_iata = arrival_data.get("iata")
-
-        existing = db.query(models.Flight).filter(
-            models.Flight.flight_number == flight_number,
-            models.Flight.direction == direction,
-            func.date(models.Flight.departure_time) == dep_parsed.date()
-        ).first()
-
-        if not existing:
-            logger.info(f"Storing: {duration_result.text} ({origin_iata} {dep_gmt_offset} → {destination_iata} {arr_gmt_offset})")
-
-            db_flight = models.Flight(
-                flight_number=flight_number,
-                origin=origin_iata,
-                destination=destination_iata,
-                direction=direction,
-                duration_minutes=duration_result.minutes,
-                duration_text=duration_result.text,
-                departure_time=dep_parsed,
-                arrival_time=arr_parsed,
-                origin_timezone=final_dep_timezone,
-                destination_timezone=final_arr_timezone,
-                origin_gmt_offset=dep_gmt_offset,
-                destination_gmt_offset=arr_gmt_offset
-            )
-            db.add(db_flight)
-        else:
-            logger.debug("Flight already exists in database")
+    candidate_rows = []
 
     logger.info(f"Processing {len(flights['arrivals'])} arrivals...")
     for flight in flights["arrivals"]:
-        process_flight_record(flight, "arrival")
+        row = _build_flight_row(flight, "arrival")
+        if row:
+            candidate_rows.append(row)
 
     logger.info(f"Processing {len(flights['departures'])} departures...")
     for flight in flights["departures"]:
-        process_flight_record(flight, "departure")
-
+        row = _build_flight_row(flight, "departure")
+        if row:
+            candidate_rows.append(row)
+
+    # one existence query for the whole batch instead of one per flight, limited
+    # to the departure days of this batch so older flights are not read back
+    incoming_keys = {(row["flight_number"], row["direction"]) for row in candidate_rows}
+    existing_keys = set()
+    if incoming_keys:
+        departure_days = [row["departure_time"].date() for row in candidate_rows]
+        range_start = datetime.combine(min(departure_days), time.min)
+        range_end = datetime.combine(max(departure_days), time.min) + timedelta(days=1)
+        existing_keys = {
+            (flight_number, direction, departure_time.date())
+            for flight_number, direction, departure_time in db.execute(
+                select(
+                    models.Flight.flight_number,
+                    models.Flight.direction,
+                    models.Flight.departure_time
+                ).where(
+                    tuple_(models.Flight.flight_number, models.Flight.direction).in_(incoming_keys),
+                    models.Flight.departure_time >= range_start,
+                    models.Flight.departure_time < range_end
+                )
+            )
+            if departure_time
+        }
+
+    new_rows = []
+    for row in candidate_rows:
+        key = (row["flight_number"], row["direction"], row["departure_time"].date())
+        if key in existing_keys:
+            logger.debug(f"Flight {row['flight_number']} already exists in database")
+            continue
+        # the API can list the same flight more than once in a response
+        existing_keys.add(key)
+        logger.info(f"Storing: {row['flight_number']} {row['duration_text']} ({row['origin']} {row['origin_gmt_offset']} → {row['destination']} {row['destination_gmt_offset']})")
+        new_rows.append(row)
+
+    added = 0
+    if new_rows:
+        # a concurrent load may have stored the same flight since the lookup above,
+        # so let the unique key resolve it instead of failing the whole batch
+        stmt = mysql_insert(models.Flight).values(new_rows)
+        stmt = stmt.on_duplicate_key_update(
+            arrival_time=stmt.inserted.arrival_time,
+            duration_minutes=stmt.inserted.duration_minutes,
+            duration_text=stmt.inserted.duration_text
+        )
+        result = db.execute(stmt)
+        # MySQL reports 1 affected row per insert and 2 per row the duplicate-key
+        # clause updated, so the excess over the batch size is the update count.
+        # a duplicate rewritten with identical values also reports 1 (the driver
+        # sets CLIENT_FOUND_ROWS), so the result is an upper bound in that case
+        updated = max(result.rowcount - len(new_rows), 0)
+        added = len(new_rows) - updated
     db.commit()
-    logger.info("All flights committed to database")
+    logger.info(f"All flights committed to database ({added} new)")
+    return added
 
 
 def recalculate_duration_with_gmt_offset(
@@ -1,13 +1,12 @@
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import bindparam, func, select
 from fastapi import HTTPException
 from app import models
-from app.config import BusinessRules, ApiConfig
+from app.config import BUSINESS_RULES, ApiConfig
 from app.logger_service import LoggerService
-from typing import Optional
+from typing import List, Optional
 
-business_rules = BusinessRules()
 api_config = ApiConfig()
 logger = LoggerService(__name__)
 
@@ -28,12 +27,35 @@ class FlightConflict:
                 f"{buffer_hours:.1f}h buffer with flight {flight_number}")
 
 
+# active assignments of one crew member departing in [start, end), with the flight
+# eager-loaded; built once at import and reused with per-call parameters
+_ACTIVE_ASSIGNMENTS_IN_RANGE = select(models.FlightAssignment).join(
+    models.Flight
+).options(
+    contains_eager(models.FlightAssignment.flight)
+).where(
+    models.FlightAssignment.crew_id == bindparam("crew_id"),
+    models.FlightAssignment.status == "active",
+    models.Flight.departure_time >= bindparam("start"),
+    models.Flight.departure_time < bindparam("end")
+).order_by(models.Flight.departure_time)
+
+
+def _day_range(first_day: date, last_day: Optional[date] = None):
+    # half-open [start, end) bounds so the departure_time index can be used,
+    # unlike wrapping the column in DATE()
+    start = datetime.combine(first_day, time.min)
+    end = datetime.combine(last_day or first_day, time.min) + timedelta(days=1)
+    return start, end
+
+
 def validate_luton_flight_sequence(
     db: Session,
     crew_id: int,
     new_flight: models.Flight,
     departure_time: datetime,
-    arrival_time: datetime
+    arrival_time: datetime,
+    existing_assignments: Optional[List[models.FlightAssignment]] = None
 ) -> None:
     """
     validate specific flight rules:
@@ -42,6 +64,9 @@ def validate_luton_flight_sequence(
     3. departure must come before arrival on the same day
     4. 3h time buffer between flights
     5. arrival flight origin must match departure flight destination (same day)
+
+    existing_assignments can be passed in when the caller already loaded the crew's
+    active assignments for the target date, to avoid querying them again
     """
     target_date = departure_time.date()
 
@@ -49,13 +74,12 @@ def validate_luton_flight_sequence(
     logger.debug(f"Route: {new_flight.origin} → {new_flight.destination}")
     logger.debug(f"Date: {target_date}")
 
-    existing_assignments = db.query(models.FlightAssignment).join(
-        models.Flight
-    ).filter(
-        models.FlightAssignment.crew_id == crew_id,
-        models.FlightAssignment.status == "active",
-        func.date(models.Flight.departure_time) == target_date
-    ).all()
+    if existing_assignments is None:
+        day_start, day_end = _day_range(target_date)
+        existing_assignments = db.scalars(
+            _ACTIVE_ASSIGNMENTS_IN_RANGE,
+            {"crew_id": crew_id, "start": day_start, "end": day_end}
+        ).all()
 
     luton_departures = []
     luton_arrivals = []
@@ -158,48 +182,42 @@ def flight_assignment_validation(
 ) -> None:
 
     if buffer_hours is None:
-        buffer_hours = business_rules.buffer_hours
+        buffer_hours = BUSINESS_RULES.buffer_hours
     buffer_delta = timedelta(hours=buffer_hours)
     target_date = departure_time.date()
 
     logger.info(f"Flight: {new_flight.flight_number} ({new_flight.direction})")
     logger.debug(f"Time: {departure_time.strftime('%H:%M')} → {arrival_time.strftime('%H:%M')}")
 
-    existing_assignment = db.query(models.FlightAssignment).filter(
-        models.FlightAssignment.crew_id == crew_id,
-        models.FlightAssignment.flight_id == new_flight.id,
-        models.FlightAssignment.status == "active"
-    ).first()
+    window_start, window_end = _day_range(target_date - timedelta(days=1), target_date + timedelta(days=1))
+
+    # one query for the surrounding days covers the duplicate check, the Luton
+    # sequence rules, the daily limit and the buffer conflicts below
+    existing_assignments = db.scalars(
+        _ACTIVE_ASSIGNMENTS_IN_RANGE,
+        {"crew_id": crew_id, "start": window_start, "end": window_end}
+    ).all()
 
-    if existing_assignment:
+    if any(a.flight_id == new_flight.id for a in existing_assignments):
         raise HTTPException(
             status_code=409,
             detail=f"Crew member is already assigned to flight {new_flight.flight_number}"
         )
 
-    validate_luton_flight_sequence(db, crew_id, new_flight, departure_time, arrival_time)
-
-    date_range_start = target_date - timedelta(days=1)
-    date_range_end = target_date + timedelta(days=1)
-
-    existing_assignments = db.query(models.FlightAssignment).join(
-        models.Flight
-    ).filter(
-        models.FlightAssignment.crew_id == crew_id,
-        models.FlightAssignment.status == "active",
-        func.date(models.Flight.departure_time) >= date_range_start,
-        func.date(models.Flight.departure_time) <= date_range_end
-    ).order_by(models.Flight.departure_time).all()
-
     daily_assignments = [a for a in existing_assignments
                          if a.flight.departure_time.date() == target_date]
 
+    validate_luton_flight_sequence(
+        db, crew_id, new_flight, departure_time, arrival_time,
+        existing_assignments=daily_assignments
+    )
+
     logger.debug(f"Found {len(daily_assignments)} flights on target date")
 
-    if len(daily_assignments) >= business_rules.max_flights_per_day:
+    if len(daily_assignments) >= BUSINESS_RULES.max_flights_per_day:
         raise HTTPException(
             status_code=409,
-            detail=f"Crew member already has {business_rules.max_flights_per_day} flights scheduled on {target_date}. "
+            detail=f"Crew member already has {BUSINESS_RULES.max_flights_per_day} flights scheduled on {target_date}. "
                    f"Maximum allowed: 1 departure + 1 arrival per day."
         )
 
@@ -225,7 +243,7 @@ def flight_assignment_validation(
             detail=f"Flight assignment conflicts detected: {conflict_details}"
         )
 
-    crew = db.query(models.CrewMember).filter(models.CrewMember.id == crew_id).first()
+    crew = db.get(models.CrewMember, crew_id)
     if not crew:
         raise HTTPException(status_code=404, detail="Crew member not found")
     
@@ -288,39 +306,38 @@ def check_flight_time_conflict(
 
 
 def validate_crew_limits_per_flight(db: Session, flight: models.Flight, crew_role: str) -> None:
-    assignments_for_flight = db.query(models.FlightAssignment).join(
-        models.CrewMember
-    ).filter(
-        models.FlightAssignment.flight_id == flight.id,
-        models.FlightAssignment.status == "active"
-    ).all()
-
-    pilots = sum(1 for a in assignments_for_flight
-                 if a.crew_member.role.lower() == "pilot")
-    attendants = sum(1 for a in assignments_for_flight
-                     if a.crew_member.role.lower() == "flight attendant")
+    role_key = func.lower(models.CrewMember.role)
+    role_counts = dict(db.execute(
+        select(role_key, func.count()).join(
+            models.FlightAssignment, models.FlightAssignment.crew_id == models.CrewMember.id
+        ).where(
+            models.FlightAssignment.flight_id == flight.id,
+            models.FlightAssignment.status == "active"
+        ).group_by(role_key)
+    ).all())
+
+    pilots = role_counts.get("pilot", 0)
+    attendants = role_counts.get("flight attendant", 0)
 
     role_lower = crew_role.lower()
-    if role_lower == "pilot" and pilots >= business_rules.max_pilots_per_flight:
+    if role_lower == "pilot" and pilots >= BUSINESS_RULES.max_pilots_per_flight:
         raise HTTPException(
             status_code=409,
-            detail=f"Flight {flight.flight_number} already has {business_rules.max_pilots_per_flight} pilots assigned"
+            detail=f"Flight {flight.flight_number} already has {BUSINESS_RULES.max_pilots_per_flight} pilots assigned"
         )
-    elif role_lower == "flight attendant" and attendants >= business_rules.max_attendants_per_flight:
+    elif role_lower == "flight attendant" and attendants >= BUSINESS_RULES.max_attendants_per_flight:
         raise HTTPException(
             status_code=409,
-            detail=f"Flight {flight.flight_number} already has {business_rules.max_attendants_per_flight} flight attendants assigned"
+            detail=f"Flight {flight.flight_number} already has {BUSINESS_RULES.max_attendants_per_flight} flight attendants assigned"
         )
 
 
 def get_crew_schedule_summary(db: Session, crew_id: int, date: datetime.date) -> dict:
-    assignments = db.query(models.FlightAssignment).join(
-        models.Flight
-    ).filter(
-        models.FlightAssignment.crew_id == crew_id,
-        models.FlightAssignment.status == "active",
-        func.date(models.Flight.departure_time) == date
-    ).order_by(models.Flight.departure_time).all()
+    day_start, day_end = _day_range(date)
+    assignments = db.scalars(
+        _ACTIVE_ASSIGNMENTS_IN_RANGE,
+        {"crew_id": crew_id, "start": day_start, "end": day_end}
+    ).all()
 
     if not assignments:
         return {"date": date.isoformat(), "flights": [], "total_duty_time": "0h 0m"}
@@ -352,7 +369,7 @@ def get_crew_schedule_summary(db: Session, crew_id: int, date: datetime.date) ->
         "duty_start": duty_start.strftime("%H:%M"),
         "duty_end": duty_end.strftime("%H:%M"),
         "total_duty_time": f"{duty_hours}h {duty_minutes}m",
-        "within_limits": duty_hours <= business_rules.duty_time_limit_hours
+        "within_limits": duty_hours <= BUSINESS_RULES.duty_time_limit_hours
     }
 
     return schedule_summary
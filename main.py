@@ -1,6 +1,7 @@
 from fastapi import FastAPI
-from app import models, routes
-from app.database import engine
+from app import routes
+from app.database import init_db, DB_POOL_SIZE
+from anyio import to_thread
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from dotenv import load_dotenv
@@ -20,13 +21,24 @@ app = FastAPI(
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Flight Crew Management API is running"}
 
 
 @app.on_event("startup")   # only for local dev, not production
 def on_startup():
-    models.Base.metadata.create_all(bind=engine)
+    # production workers can skip the per-boot schema check with DB_AUTO_CREATE=false
+    if os.getenv("DB_AUTO_CREATE", "true").lower() == "true":
+        init_db()
+
+
+@app.on_event("startup")
+async def limit_threadpool():
+    # sync handlers each hold a DB connection; more threads than pooled
+    # connections only queue up on checkout, so size the pool to match
+    to_thread.current_default_thread_limiter().total_tokens = int(
+        os.getenv("THREADPOOL_SIZE", str(DB_POOL_SIZE))
+    )
 
 
 app.include_router(routes.router)